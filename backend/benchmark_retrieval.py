@@ -0,0 +1,113 @@
+# FILE: backend/benchmark_retrieval.py
+# Latency/throughput of batched vs unbatched retrieval under concurrency
+#
+# Usage: python benchmark_retrieval.py
+#
+# Uses an in-memory Chroma index and a stand-in embedding function that sleeps
+# to simulate the network round-trip of a hosted embedding API.
+
+import asyncio
+import contextlib
+import hashlib
+import io
+import os
+import random
+import statistics
+import time
+
+# Disable caches so every request has to embed and search
+os.environ["EMBEDDING_CACHE_SIZE"] = "0"
+os.environ["RETRIEVAL_CACHE_SIZE"] = "0"
+os.environ.pop("OPENAI_API_KEY", None)
+
+from services.document_service import DocumentService, LOCAL_EMBEDDING_MODEL
+from services.retrieval_dispatcher import RetrievalDispatcher
+
+EMBEDDING_LATENCY_MS = 40
+EMBEDDING_DIM = 64
+DOCUMENTS = 4
+CHUNKS_PER_DOCUMENT = 200
+CONCURRENCY_LEVELS = [1, 8, 32, 128]
+WINDOWS_MS = [0, 2, 5, 10]
+
+
+class SimulatedEmbeddingFunction:
+    def __call__(self, input):
+        time.sleep(EMBEDDING_LATENCY_MS / 1000)
+        return [self.embed(text) for text in input]
+
+    def embed(self, text):
+        rng = random.Random(hashlib.md5(text.encode()).hexdigest())
+        return [rng.uniform(-1, 1) for _ in range(EMBEDDING_DIM)]
+
+
+def build_service():
+    doc_service = DocumentService()
+    embedding_func = SimulatedEmbeddingFunction()
+    doc_service.embedding_functions[LOCAL_EMBEDDING_MODEL] = embedding_func
+
+    doc_ids = []
+    for d in range(DOCUMENTS):
+        doc_id = f"bench{d}"
+        chunks = [f"document {d} chunk {i} about topic {i % 17}" for i in range(CHUNKS_PER_DOCUMENT)]
+        collection = doc_service.chroma_client.get_or_create_collection(
+            name=f"doc_{doc_id}",
+            embedding_function=embedding_func,
+            metadata={"embedding_model": LOCAL_EMBEDDING_MODEL}
+        )
+        collection.add(
+            documents=chunks,
+            embeddings=[embedding_func.embed(chunk) for chunk in chunks],
+            ids=[f"{doc_id}_{i}" for i in range(len(chunks))]
+        )
+        doc_ids.append(doc_id)
+
+    return doc_service, doc_ids
+
+
+async def run(doc_service, doc_ids, concurrency, window_ms):
+    dispatcher = RetrievalDispatcher(doc_service, window_ms=window_ms)
+    embedding_calls = doc_service.embedding_calls
+    vector_queries = doc_service.vector_queries
+    latencies = []
+
+    async def one(i):
+        start = time.perf_counter()
+        await dispatcher.retrieve(doc_ids[i % len(doc_ids)], f"question {i} at {concurrency}/{window_ms}")
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "throughput": concurrency / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+        "embedding_calls": doc_service.embedding_calls - embedding_calls,
+        "vector_queries": doc_service.vector_queries - vector_queries,
+        "batches": dispatcher.batches
+    }
+
+
+async def main():
+    doc_service, doc_ids = build_service()
+
+    print(f"Simulated embedding latency: {EMBEDDING_LATENCY_MS} ms, "
+          f"{DOCUMENTS} documents x {CHUNKS_PER_DOCUMENT} chunks\n")
+    print(f"{'concurrency':>11} {'window_ms':>9} {'req/s':>9} {'p50_ms':>8} {'p95_ms':>8} "
+          f"{'embed_calls':>11} {'vec_queries':>11} {'batches':>7}")
+
+    for concurrency in CONCURRENCY_LEVELS:
+        for window_ms in WINDOWS_MS:
+            # Keep the service's per-request logging out of the table
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = await run(doc_service, doc_ids, concurrency, window_ms)
+            print(f"{concurrency:>11} {window_ms:>9} {result['throughput']:>9.1f} "
+                  f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+                  f"{result['embedding_calls']:>11} {result['vector_queries']:>11} {result['batches']:>7}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
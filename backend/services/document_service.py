@@ -0,0 +1,431 @@
+# import fitz  # PyMuPDF
+# import chromadb
+# from chromadb.utils import embedding_functions
+# import uuid
+# import os
+
+# class DocumentService:
+#     def __init__(self):
+#         self.chroma_client = chromadb.Client()
+#         openai_key = os.getenv("OPENAI_API_KEY")
+        
+#         if openai_key:
+#             self.openai_ef = embedding_functions.OpenAIEmbeddingFunction(
+#                 api_key=openai_key,
+#                 model_name="text-embedding-ada-002"
+#             )
+#         else:
+#             # Fallback to default embedding function
+#             self.openai_ef = embedding_functions.DefaultEmbeddingFunction()
+        
+#     def extract_text_from_pdf(self, pdf_bytes):
+#         """Extract text from PDF bytes"""
+#         try:
+#             doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+#             text = ""
+#             for page in doc:
+#                 text += page.get_text()
+#             doc.close()
+#             return text
+#         except Exception as e:
+#             raise Exception(f"Error extracting text from PDF: {str(e)}")
+    
+#     async def process_document(self, file_bytes, filename):
+#         """Process document: extract text, create embeddings, store in ChromaDB"""
+#         doc_id = str(uuid.uuid4())
+        
+#         # Extract text from PDF
+#         text = self.extract_text_from_pdf(file_bytes)
+        
+#         if not text.strip():
+#             raise Exception("No text content found in PDF")
+        
+#         # Split text into chunks
+#         chunks = self.chunk_text(text)
+        
+#         # Create or get collection
+#         collection = self.chroma_client.get_or_create_collection(
+#             name=f"doc_{doc_id}",
+#             embedding_function=self.openai_ef
+#         )
+        
+#         # Add documents to collection
+#         collection.add(
+#             documents=chunks,
+#             ids=[f"{doc_id}_{i}" for i in range(len(chunks))],
+#             metadatas=[{"chunk_id": i, "filename": filename} for i in range(len(chunks))]
+#         )
+        
+#         return doc_id
+    
+#     def chunk_text(self, text, chunk_size=500, overlap=50):
+#         """Split text into overlapping chunks"""
+#         words = text.split()
+#         chunks = []
+        
+#         for i in range(0, len(words), chunk_size - overlap):
+#             chunk = " ".join(words[i:i + chunk_size])
+#             if chunk:
+#                 chunks.append(chunk)
+        
+#         return chunks if chunks else [text]
+    
+#     def retrieve_context(self, doc_id, query, top_k=3):
+#         """Retrieve relevant context from document based on query"""
+#         try:
+#             collection = self.chroma_client.get_collection(
+#                 name=f"doc_{doc_id}",
+#                 embedding_function=self.openai_ef
+#             )
+            
+#             results = collection.query(
+#                 query_texts=[query],
+#                 n_results=top_k
+#             )
+            
+#             if results and results['documents']:
+#                 return "\n\n".join(results['documents'][0])
+#             return ""
+#         except Exception as e:
+#             print(f"Error retrieving context: {str(e)}")
+#             return ""
+# FILE: backend/services/document_service.py
+# FIXED VERSION - Better error handling
+
+import fitz
+import chromadb
+from chromadb.utils import embedding_functions
+import uuid
+import os
+import threading
+
+from services.retrieval_cache import LRUCache, normalize_query
+
+DEFAULT_EMBEDDING_MODEL = "text-embedding-ada-002"
+# Name recorded for collections embedded with chromadb's built-in model
+LOCAL_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+class DocumentNotFoundError(Exception):
+    pass
+
+class DocumentService:
+    def __init__(self):
+        self.chroma_client = chromadb.Client()
+        self.openai_key = os.getenv("OPENAI_API_KEY")
+        
+        # Embedding functions are reused per model instead of rebuilt per call
+        self.embedding_functions = {}
+        # Embedding model each document was indexed with, keyed by document id
+        self.document_models = {}
+        # Bumped whenever a document is re-ingested or deleted
+        self.document_versions = {}
+        
+        self.embedding_cache = LRUCache(int(os.getenv("EMBEDDING_CACHE_SIZE", "1024")))
+        self.result_cache = LRUCache(int(os.getenv("RETRIEVAL_CACHE_SIZE", "1024")))
+        
+        # Round-trips to the embedding model and the vector index
+        self.embedding_calls = 0
+        self.vector_queries = 0
+        # Batches run in worker threads; guards the counters and lazily filled maps
+        self._lock = threading.Lock()
+        
+        if self.openai_key:
+            try:
+                self.openai_ef = self.get_embedding_function(DEFAULT_EMBEDDING_MODEL)
+            except Exception as e:
+                print(f"Warning: Could not initialize OpenAI embeddings: {e}")
+                self.openai_key = None
+                self.openai_ef = self.get_embedding_function(LOCAL_EMBEDDING_MODEL)
+        else:
+            print("Warning: No OpenAI API key found, using default embeddings")
+            self.openai_ef = self.get_embedding_function(LOCAL_EMBEDDING_MODEL)
+    
+    def resolve_embedding_model(self, model_name=DEFAULT_EMBEDDING_MODEL):
+        """Map a requested embedding model to the one that will actually be used"""
+        if not self.openai_key:
+            return LOCAL_EMBEDDING_MODEL
+        return model_name
+    
+    def get_embedding_function(self, model_name=DEFAULT_EMBEDDING_MODEL):
+        """Get embedding function based on model"""
+        model_name = self.resolve_embedding_model(model_name)
+        
+        with self._lock:
+            if model_name not in self.embedding_functions:
+                if model_name == LOCAL_EMBEDDING_MODEL:
+                    embedding_func = embedding_functions.DefaultEmbeddingFunction()
+                else:
+                    embedding_func = embedding_functions.OpenAIEmbeddingFunction(
+                        api_key=self.openai_key,
+                        model_name=model_name
+                    )
+                self.embedding_functions[model_name] = embedding_func
+            
+            return self.embedding_functions[model_name]
+        
+    def extract_text_from_pdf(self, pdf_bytes):
+        """Extract text from PDF bytes"""
+        try:
+            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+            text = ""
+            for page in doc:
+                text += page.get_text()
+            doc.close()
+            return text
+        except Exception as e:
+            raise Exception(f"Error extracting text from PDF: {str(e)}")
+    
+    async def process_document(self, file_bytes, filename, embedding_model=DEFAULT_EMBEDDING_MODEL,
+                               doc_id=None):
+        """Process document: extract text, create embeddings, store in ChromaDB
+
+        Passing an existing doc_id re-ingests that document in place.
+        """
+        reingest = doc_id is not None
+        if reingest and not self.document_exists(doc_id):
+            raise DocumentNotFoundError(f"Document {doc_id} not found")
+        
+        try:
+            if not reingest:
+                doc_id = str(uuid.uuid4())
+            
+            # Extract text from PDF
+            text = self.extract_text_from_pdf(file_bytes)
+            
+            if not text.strip():
+                raise Exception("No text content found in PDF. The PDF might be image-based or empty.")
+            
+            # Split text into chunks
+            chunks = self.chunk_text(text)
+            
+            print(f"Processing document: {filename}")
+            print(f"Extracted {len(text)} characters")
+            print(f"Created {len(chunks)} chunks")
+            
+            # Remember which model built the index so retrieval embeds queries the same way
+            embedding_model = self.resolve_embedding_model(embedding_model)
+            embedding_func = self.get_embedding_function(embedding_model)
+            
+            # Embed up front so a failed API call leaves any existing index untouched
+            embeddings = embedding_func(chunks)
+            
+            if reingest:
+                self.chroma_client.delete_collection(name=f"doc_{doc_id}")
+            
+            # Create or get collection
+            collection = self.chroma_client.get_or_create_collection(
+                name=f"doc_{doc_id}",
+                embedding_function=embedding_func,
+                metadata={"embedding_model": embedding_model}
+            )
+            
+            # Add documents to collection
+            collection.add(
+                documents=chunks,
+                embeddings=embeddings,
+                ids=[f"{doc_id}_{i}" for i in range(len(chunks))],
+                metadatas=[{"chunk_id": i, "filename": filename} for i in range(len(chunks))]
+            )
+            
+            self.document_models[doc_id] = embedding_model
+            if reingest:
+                self.invalidate_document(doc_id)
+            
+            print(f"Successfully stored document with ID: {doc_id}")
+            
+            return doc_id
+            
+        except Exception as e:
+            error_msg = str(e)
+            
+            # Check for quota error
+            if "quota" in error_msg.lower() or "429" in error_msg:
+                raise Exception("""OpenAI API Quota Exceeded. 
+
+To fix this:
+1. Go to https://platform.openai.com/account/billing
+2. Add payment method and credits
+3. Wait a few minutes
+4. Try uploading again
+
+The document upload requires API calls to create embeddings.""")
+            
+            # Check for authentication error
+            elif "authentication" in error_msg.lower() or "401" in error_msg:
+                raise Exception("""Invalid OpenAI API Key.
+
+To fix this:
+1. Get a valid API key from https://platform.openai.com/api-keys
+2. Update your .env file with the correct key
+3. Restart the backend server
+4. Try uploading again""")
+            
+            else:
+                raise Exception(f"Error processing document: {error_msg}")
+    
+    def chunk_text(self, text, chunk_size=500, overlap=50):
+        """Split text into overlapping chunks"""
+        words = text.split()
+        chunks = []
+        
+        for i in range(0, len(words), chunk_size - overlap):
+            chunk = " ".join(words[i:i + chunk_size])
+            if chunk:
+                chunks.append(chunk)
+        
+        return chunks if chunks else [text]
+    
+    def document_exists(self, doc_id):
+        """Check whether a document has been indexed"""
+        try:
+            self.chroma_client.get_collection(name=f"doc_{doc_id}")
+            return True
+        except ValueError:
+            return False
+    
+    def delete_document(self, doc_id):
+        """Remove a document's index and drop everything cached for it"""
+        try:
+            self.chroma_client.delete_collection(name=f"doc_{doc_id}")
+        except ValueError:
+            raise DocumentNotFoundError(f"Document {doc_id} not found")
+        self.document_models.pop(doc_id, None)
+        self.invalidate_document(doc_id)
+    
+    def invalidate_document(self, doc_id):
+        """Drop cached top-k results for a re-ingested or deleted document"""
+        # Bumping the version orphans results that in-flight retrievals write back later
+        with self._lock:
+            self.document_versions[doc_id] = self.document_versions.get(doc_id, 0) + 1
+        self.result_cache.invalidate(lambda key: key[0] == doc_id)
+    
+    def get_document_collection(self, doc_id):
+        """Get a document's collection along with the embedding model it was indexed with"""
+        model_name = self.document_models.get(doc_id)
+        
+        if model_name is not None:
+            collection = self.chroma_client.get_collection(
+                name=f"doc_{doc_id}",
+                embedding_function=self.get_embedding_function(model_name)
+            )
+            return collection, model_name
+        
+        # The model is only known from the collection's metadata; queries are sent as
+        # precomputed embeddings, so the collection's own embedding function is unused
+        collection = self.chroma_client.get_collection(name=f"doc_{doc_id}")
+        metadata = collection.metadata or {}
+        # Collections created before the model was recorded used the default embeddings
+        with self._lock:
+            model_name = self.document_models.setdefault(
+                doc_id, metadata.get("embedding_model", self.resolve_embedding_model())
+            )
+        return collection, model_name
+    
+    def embed_queries(self, queries, model_name):
+        """Embed queries in one call, reusing cached embeddings for the same model and text"""
+        texts = [normalize_query(query) for query in queries]
+        embeddings = {}
+        missing = []
+        
+        for text in texts:
+            if text in embeddings or text in missing:
+                continue
+            embedding = self.embedding_cache.get((model_name, text))
+            if embedding is None:
+                missing.append(text)
+            else:
+                embeddings[text] = embedding
+        
+        if missing:
+            with self._lock:
+                self.embedding_calls += 1
+            for text, embedding in zip(missing, self.get_embedding_function(model_name)(missing)):
+                self.embedding_cache.put((model_name, text), embedding)
+                embeddings[text] = embedding
+        
+        return [embeddings[text] for text in texts]
+    
+    def get_cache_stats(self):
+        """Hit/miss statistics for the retrieval caches"""
+        with self._lock:
+            embedding_calls = self.embedding_calls
+            vector_queries = self.vector_queries
+        return {
+            "embeddings": self.embedding_cache.stats(),
+            "results": self.result_cache.stats(),
+            "embedding_calls": embedding_calls,
+            "vector_queries": vector_queries
+        }
+    
+    def retrieve_context(self, doc_id, query, top_k=3):
+        """Retrieve relevant context from document based on query"""
+        return self.retrieve_context_batch([(doc_id, query, top_k)])[0]
+    
+    def retrieve_context_batch(self, requests):
+        """Retrieve context for many (doc_id, query, top_k) requests at once
+
+        Queries are embedded in one call per embedding model and searched with
+        one multi-query lookup per document.
+        """
+        contexts = [""] * len(requests)
+        pending = {}
+        
+        for i, (doc_id, query, top_k) in enumerate(requests):
+            cache_key = (doc_id, self.document_versions.get(doc_id, 0), normalize_query(query), top_k)
+            context = self.result_cache.get(cache_key)
+            if context is None:
+                pending.setdefault(doc_id, []).append((i, query, top_k, cache_key))
+            else:
+                contexts[i] = context
+        
+        # Resolve each document's index, then group the queries by embedding model
+        collections = {}
+        queries_by_model = {}
+        for doc_id, items in pending.items():
+            try:
+                collection, model_name = self.get_document_collection(doc_id)
+            except Exception as e:
+                print(f"Error retrieving context: {str(e)}")
+                continue
+            collections[doc_id] = (collection, model_name)
+            queries_by_model.setdefault(model_name, []).extend(query for _, query, _, _ in items)
+        
+        embeddings = {}
+        for model_name, queries in queries_by_model.items():
+            try:
+                for query, embedding in zip(queries, self.embed_queries(queries, model_name)):
+                    embeddings[(model_name, normalize_query(query))] = embedding
+            except Exception as e:
+                print(f"Error retrieving context: {str(e)}")
+        
+        for doc_id, (collection, model_name) in collections.items():
+            items = [item for item in pending[doc_id]
+                     if (model_name, normalize_query(item[1])) in embeddings]
+            if not items:
+                continue
+            
+            texts = list(dict.fromkeys(normalize_query(query) for _, query, _, _ in items))
+            n_results = max(top_k for _, _, top_k, _ in items)
+            
+            try:
+                with self._lock:
+                    self.vector_queries += 1
+                results = collection.query(
+                    query_embeddings=[embeddings[(model_name, text)] for text in texts],
+                    n_results=n_results
+                )
+            except Exception as e:
+                print(f"Error retrieving context: {str(e)}")
+                continue
+            
+            if not results or not results['documents']:
+                continue
+            
+            for i, query, top_k, cache_key in items:
+                documents = results['documents'][texts.index(normalize_query(query))]
+                context = "\n\n".join(documents[:top_k])
+                print(f"Retrieved {len(context)} characters of context")
+                self.result_cache.put(cache_key, context)
+                contexts[i] = context
+        
+        return contexts
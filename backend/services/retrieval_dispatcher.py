@@ -0,0 +1,86 @@
+# FILE: backend/services/retrieval_dispatcher.py
+# Coalesces concurrent retrieval calls into batched embedding + vector queries
+
+import asyncio
+import os
+
+
+class RetrievalDispatcher:
+    def __init__(self, doc_service, window_ms=None, max_batch_size=None):
+        self.doc_service = doc_service
+
+        if window_ms is None:
+            window_ms = float(os.getenv("RETRIEVAL_BATCH_WINDOW_MS", "5"))
+        if max_batch_size is None:
+            max_batch_size = int(os.getenv("RETRIEVAL_MAX_BATCH_SIZE", "64"))
+
+        # How long the first request in a batch waits for others to join it
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+
+        self.requests = 0
+        self.batches = 0
+
+    async def retrieve(self, doc_id, query, top_k=3):
+        """Retrieve context, sharing embedding and index calls with concurrent callers"""
+        self.requests += 1
+
+        if self.window <= 0 or self.max_batch_size <= 1:
+            self.batches += 1
+            return await asyncio.to_thread(self.doc_service.retrieve_context, doc_id, query, top_k)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((doc_id, query, top_k, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Hand the pending requests to a background batch"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        self.batches += 1
+        task = asyncio.ensure_future(self._run_batch(batch))
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch):
+        requests = [(doc_id, query, top_k) for doc_id, query, top_k, _ in batch]
+        contexts = [""] * len(batch)
+
+        try:
+            contexts = await asyncio.to_thread(self.doc_service.retrieve_context_batch, requests)
+        except Exception as e:
+            print(f"Error retrieving context: {str(e)}")
+        finally:
+            # Resolve every waiter even if this task is cancelled, so no request hangs
+            for (_, _, _, future), context in zip(batch, contexts):
+                # The caller may have been cancelled while the batch was running
+                if not future.done():
+                    future.set_result(context)
+
+    def get_stats(self):
+        """Batching statistics for the dispatcher"""
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch_size": self.max_batch_size,
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0
+        }
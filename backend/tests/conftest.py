@@ -0,0 +1,83 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeCollection:
+    def __init__(self, name, metadata=None):
+        self.name = name
+        self.metadata = metadata
+        self.documents = []
+        self.embeddings = []
+        self.query_calls = 0
+
+    def add(self, documents, ids, embeddings=None, metadatas=None):
+        self.documents.extend(documents)
+        self.embeddings.extend(embeddings)
+
+    def query(self, query_embeddings, n_results):
+        self.query_calls += 1
+        results = []
+        for query_embedding in query_embeddings:
+            ranked = sorted(
+                range(len(self.documents)),
+                key=lambda i: -sum(a * b for a, b in zip(query_embedding, self.embeddings[i]))
+            )
+            results.append([self.documents[i] for i in ranked[:n_results]])
+        return {"documents": results}
+
+
+class FakeChromaClient:
+    def __init__(self):
+        self.collections = {}
+
+    def get_or_create_collection(self, name, embedding_function=None, metadata=None):
+        if name not in self.collections:
+            self.collections[name] = FakeCollection(name, metadata)
+        return self.collections[name]
+
+    def get_collection(self, name, embedding_function=None):
+        if name not in self.collections:
+            raise ValueError(f"Collection {name} does not exist.")
+        return self.collections[name]
+
+    def delete_collection(self, name):
+        if name not in self.collections:
+            raise ValueError(f"Collection {name} does not exist.")
+        del self.collections[name]
+
+
+class FakeEmbeddingFunction:
+    def __init__(self, offset=0.0):
+        self.offset = offset
+        self.calls = []
+        self.fail = False
+
+    def __call__(self, input):
+        if self.fail:
+            raise Exception("Error code: 429 - quota exceeded")
+        self.calls.append(list(input))
+        return [[float(len(text)), float(sum(map(ord, text)) % 97) + self.offset] for text in input]
+
+
+@pytest.fixture
+def doc_service(monkeypatch):
+    """DocumentService backed by an in-memory fake Chroma client and fake embeddings"""
+    pytest.importorskip("chromadb")
+    pytest.importorskip("fitz")
+    from services.document_service import DocumentService
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    service = DocumentService()
+    service.chroma_client = FakeChromaClient()
+    # Let requested model names through and serve them from fakes
+    service.openai_key = "test-key"
+    service.embedding_functions = {
+        "model-a": FakeEmbeddingFunction(),
+        "model-b": FakeEmbeddingFunction(offset=1000.0)
+    }
+    service.extract_text_from_pdf = lambda pdf_bytes: pdf_bytes.decode()
+    return service
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+
+def ingest(doc_service, text, embedding_model="model-a", doc_id=None):
+    return asyncio.run(doc_service.process_document(
+        text.encode(), "doc.pdf", embedding_model=embedding_model, doc_id=doc_id
+    ))
+
+
+def test_repeat_query_served_from_result_cache(doc_service):
+    doc_id = ingest(doc_service, "alpha beta gamma")
+    embedding_func = doc_service.embedding_functions["model-a"]
+
+    first = doc_service.retrieve_context(doc_id, "what is alpha")
+    second = doc_service.retrieve_context(doc_id, "  what is   alpha ")
+
+    assert first == second == "alpha beta gamma"
+    assert embedding_func.calls[-1] == ["what is alpha"]
+    assert doc_service.get_cache_stats()["results"]["hits"] == 1
+    assert doc_service.vector_queries == 1
+
+
+def test_reingest_invalidates_cached_results(doc_service):
+    doc_id = ingest(doc_service, "old content")
+    assert doc_service.retrieve_context(doc_id, "query") == "old content"
+
+    ingest(doc_service, "new content", doc_id=doc_id)
+
+    assert doc_service.retrieve_context(doc_id, "query") == "new content"
+    assert doc_service.document_versions[doc_id] == 1
+
+
+def test_failed_reingest_keeps_existing_index(doc_service):
+    doc_id = ingest(doc_service, "old content")
+    doc_service.retrieve_context(doc_id, "query")
+    doc_service.embedding_functions["model-a"].fail = True
+
+    with pytest.raises(Exception, match="Quota"):
+        ingest(doc_service, "new content", doc_id=doc_id)
+
+    doc_service.embedding_functions["model-a"].fail = False
+    assert doc_service.chroma_client.get_collection(f"doc_{doc_id}").documents == ["old content"]
+    assert doc_service.retrieve_context(doc_id, "query") == "old content"
+
+
+def test_delete_invalidates_cached_results(doc_service):
+    doc_id = ingest(doc_service, "some content")
+    doc_service.retrieve_context(doc_id, "query")
+
+    doc_service.delete_document(doc_id)
+
+    assert len(doc_service.result_cache) == 0
+    assert doc_service.document_versions[doc_id] == 1
+    assert doc_service.retrieve_context(doc_id, "query") == ""
+
+
+def test_delete_during_inflight_query_is_not_cached(doc_service):
+    doc_id = ingest(doc_service, "secret content")
+    collection = doc_service.chroma_client.get_collection(f"doc_{doc_id}")
+    query = collection.query
+
+    def query_then_delete(query_embeddings, n_results):
+        results = query(query_embeddings, n_results)
+        doc_service.delete_document(doc_id)
+        return results
+
+    collection.query = query_then_delete
+
+    # The in-flight call still sees the results it fetched, but must not cache them
+    assert doc_service.retrieve_context(doc_id, "query") == "secret content"
+    assert not doc_service.document_exists(doc_id)
+    assert doc_service.retrieve_context(doc_id, "query") == ""
+
+
+def test_unknown_document_raises_not_found(doc_service):
+    from services.document_service import DocumentNotFoundError
+
+    with pytest.raises(DocumentNotFoundError):
+        doc_service.delete_document("missing")
+    with pytest.raises(DocumentNotFoundError):
+        ingest(doc_service, "content", doc_id="missing")
+    assert "missing" not in doc_service.document_versions
+
+
+def test_query_embedded_with_document_model(doc_service):
+    doc_a = ingest(doc_service, "indexed with a", embedding_model="model-a")
+    doc_b = ingest(doc_service, "indexed with b", embedding_model="model-b")
+    embed_a = doc_service.embedding_functions["model-a"]
+    embed_b = doc_service.embedding_functions["model-b"]
+    # Forget the in-memory mapping so the model is read back from collection metadata
+    doc_service.document_models.clear()
+    lookups = []
+    get_collection = doc_service.chroma_client.get_collection
+    doc_service.chroma_client.get_collection = lambda name, **kwargs: (
+        lookups.append(name) or get_collection(name, **kwargs)
+    )
+
+    doc_service.retrieve_context(doc_a, "question for a")
+    doc_service.retrieve_context(doc_b, "question for b")
+
+    assert lookups == [f"doc_{doc_a}", f"doc_{doc_b}"]
+
+    assert ["question for a"] in embed_a.calls
+    assert ["question for a"] not in embed_b.calls
+    assert ["question for b"] in embed_b.calls
+    assert ["question for b"] not in embed_a.calls
@@ -0,0 +1,36 @@
+from services.retrieval_cache import LRUCache, normalize_query
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_maxsize_zero_stores_nothing():
+    cache = LRUCache(maxsize=0)
+    cache.put("a", 1)
+
+    assert len(cache) == 0
+    assert cache.get("a") is None
+
+
+def test_invalidate_drops_matching_keys():
+    cache = LRUCache()
+    cache.put(("doc1", "q"), 1)
+    cache.put(("doc2", "q"), 2)
+    cache.invalidate(lambda key: key[0] == "doc1")
+
+    assert cache.get(("doc1", "q")) is None
+    assert cache.get(("doc2", "q")) == 2
+
+
+def test_normalize_query_only_collapses_whitespace():
+    assert normalize_query("  What is\n the   US GDP? ") == "What is the US GDP?"
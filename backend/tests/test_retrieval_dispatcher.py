@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+from services.retrieval_dispatcher import RetrievalDispatcher
+
+
+class SlowDocService:
+    def __init__(self, delay):
+        self.delay = delay
+
+    def retrieve_context_batch(self, requests):
+        time.sleep(self.delay)
+        return [f"context for {query}" for _, query, _ in requests]
+
+
+def test_concurrent_retrievals_share_embedding_and_query_calls(doc_service):
+    doc_ids = [
+        asyncio.run(doc_service.process_document(text.encode(), "doc.pdf", embedding_model="model-a"))
+        for text in ("first document", "second document")
+    ]
+    embedding_func = doc_service.embedding_functions["model-a"]
+    embedding_calls = len(embedding_func.calls)
+    dispatcher = RetrievalDispatcher(doc_service, window_ms=50, max_batch_size=64)
+
+    async def run():
+        return await asyncio.gather(*(
+            dispatcher.retrieve(doc_ids[i % 2], f"question {i}", top_k=1) for i in range(10)
+        ))
+
+    contexts = asyncio.run(run())
+
+    assert contexts == ["first document", "second document"] * 5
+    assert len(embedding_func.calls) == embedding_calls + 1
+    assert len(embedding_func.calls[-1]) == 10
+    for doc_id in doc_ids:
+        assert doc_service.chroma_client.get_collection(f"doc_{doc_id}").query_calls == 1
+    assert dispatcher.batches == 1
+
+
+def test_cancelled_caller_does_not_affect_batch():
+    dispatcher = RetrievalDispatcher(SlowDocService(0.05), window_ms=20)
+
+    async def run():
+        cancelled = asyncio.ensure_future(dispatcher.retrieve("doc", "first"))
+        kept = asyncio.ensure_future(dispatcher.retrieve("doc", "second"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        return await kept, cancelled
+
+    context, cancelled = asyncio.run(run())
+
+    assert context == "context for second"
+    assert cancelled.cancelled()
+
+
+def test_aborted_batch_resolves_waiters():
+    class BatchAborted(BaseException):
+        pass
+
+    class AbortingDocService:
+        def retrieve_context_batch(self, requests):
+            raise BatchAborted()
+
+    dispatcher = RetrievalDispatcher(AbortingDocService(), window_ms=1)
+
+    async def run():
+        return await asyncio.wait_for(dispatcher.retrieve("doc", "query"), timeout=1)
+
+    assert asyncio.run(run()) == ""